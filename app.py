@@ -1,9 +1,11 @@
 # app.py
 from app import create_app
 from rich import print
+import os
 
 app = create_app()
 
 if __name__ == "__main__":
     print("[bold green]Starting Portfolio Optimizer Flask app...")
-    app.run(debug=True)
+    # Development server only; production runs under gunicorn (see gunicorn_conf.py)
+    app.run(debug=os.getenv('FLASK_ENV') == 'development')
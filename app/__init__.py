@@ -1,13 +1,22 @@
 # app/__init__.py
-from flask import Flask
-from rich import print
-import os
-
-# app/__init__.py
-from flask import Flask
+from flask import (
+    Flask, Response, flash, get_flashed_messages, redirect, render_template, request, session,
+    url_for,
+)
 from rich import print
 import os
+import re
+import hashlib
+import json
+import secrets
 from dotenv import load_dotenv
+from werkzeug.exceptions import HTTPException
+from bokeh.embed import file_html
+from bokeh.resources import CDN, INLINE
+from app.cache import Cache, frame_from_bytes, frame_to_bytes
+from app.data_loader import DataLoader
+from app.portfolio_optimizer import PortfolioOptimizer
+from app.plots import combined_layout
 
 load_dotenv()
 
@@ -15,8 +24,31 @@ base_dir = os.path.abspath(os.path.dirname(__file__))
 template_dir = os.path.abspath(os.path.join(base_dir, '..', 'templates'))
 app = Flask(__name__, template_folder=template_dir)
 app.config['SECRET_KEY'] = os.environ['SECRET_KEY']
-app.config['DEBUG'] = True  # Enable debug mode for development
+app.config['DEBUG'] = os.getenv('FLASK_ENV') == 'development'  # Debug only in development
 app.config['TEMPLATES_AUTO_RELOAD'] = True
+app.config['PRICE_CACHE_TTL'] = int(os.getenv('PRICE_CACHE_TTL', 900))  # Fresh price data, seconds
+app.config['PRICE_CACHE_STALE_TTL'] = int(os.getenv('PRICE_CACHE_STALE_TTL', 86400))  # Fallback copy, seconds
+app.config['REPORT_TTL'] = int(os.getenv('REPORT_TTL', 1800))  # Rendered results pages, seconds
+# 'cdn' links BokehJS from cdn.bokeh.org (small, browser-cacheable pages); 'inline' embeds it for offline use
+app.config['BOKEH_RESOURCES'] = os.getenv('BOKEH_RESOURCES', 'cdn')
+
+# Price data and rendered reports; Redis when REDIS_URL is set, otherwise in-process
+cache = Cache(os.getenv('REDIS_URL'))
+
+# Server-side sessions in Redis: the cookie carries only a session ID
+if cache.redis is not None:
+    from flask_session import Session
+    app.config['SESSION_TYPE'] = 'redis'
+    app.config['SESSION_REDIS'] = cache.redis
+    Session(app)
+
+_SYMBOL_RE = re.compile(r'^[A-Z0-9.\-]+$')
+
+
+def create_app():
+    """Return the configured Flask app (entrypoint for `gunicorn "app:create_app()"`)."""
+    return app
+
 
 if __name__ == "__main__":
     port = int(os.getenv('PORT', 5000))  # Default to 5000 if PORT not set
@@ -24,7 +56,6 @@ if __name__ == "__main__":
 
 @app.route("/", methods=["GET"])
 def main():
-    from flask import render_template, request, get_flashed_messages
     error = request.args.get('error')
     messages = get_flashed_messages()
     return render_template("index.html", error=error, messages=messages)
@@ -34,17 +65,8 @@ def optimize():
     """
     Handle optimization form submission, validate inputs, run backend logic, generate Bokeh HTML, and serve it.
     """
-    from flask import request, send_file, redirect, url_for, flash, session
-    import os
-    import pandas as pd
-    from app.data_loader import DataLoader, DataLoaderError
-    from app.portfolio_optimizer import PortfolioOptimizer, PortfolioOptimizerError
-    from app.plots import combined_layout
-    from bokeh.plotting import output_file, save
-    from rich import print as rich_print
-    import re
-
-    # Parse and validate form data
+    # Parse and validate form data; every check runs before the cache or DataLoader
+    # is touched, so bad input is rejected without any data or compute work
     symbols_raw = request.form.get('symbols', '').strip()
     start_date = request.form.get('start_date', '').strip()
     end_date = request.form.get('end_date', '').strip()
@@ -56,7 +78,7 @@ def optimize():
         flash("Please enter at least one stock symbol.", "error")
         return redirect(url_for('main'))
     symbols = [s.strip().upper() for s in symbols_raw.split(',') if s.strip()]
-    if not symbols or any(not re.match(r'^[A-Z0-9.\-]+$', s) for s in symbols):
+    if not symbols or any(not _SYMBOL_RE.match(s) for s in symbols):
         flash("Invalid symbol(s) detected. Use only letters, numbers, dashes, or dots.", "error")
         return redirect(url_for('main'))
 
@@ -77,62 +99,99 @@ def optimize():
         flash("Number of portfolios must be an integer between 100 and 10,000.", "error")
         return redirect(url_for('main'))
 
-        # Validate num_portfolios
-        try:
-            num_portfolios = int(num_portfolios_raw)
-            if not (100 <= num_portfolios <= 10000):
-                raise ValueError
-        except Exception:
-            flash("Number of portfolios must be an integer between 100 and 10,000.", "error")
-            return redirect(url_for('main'))
-
-        # Validate risk_free_rate
-        try:
-            risk_free_rate = float(risk_free_rate_raw)
-        except Exception:
-            flash("Risk-free rate must be a valid number.", "error")
-            return redirect(url_for('main'))
+    # Validate risk_free_rate
+    try:
+        risk_free_rate = float(risk_free_rate_raw)
+    except Exception:
+        flash("Risk-free rate must be a valid number.", "error")
+        return redirect(url_for('main'))
 
-        # Run DataLoader
+    # Run DataLoader, reusing cached prices for identical (symbols, dates, interval) requests
+    interval = '1D'
+    cache_key = "prices:npz:" + hashlib.sha1(
+        json.dumps([sorted(symbols), start_date, end_date, interval]).encode()
+    ).hexdigest()
+    cached = cache.get(cache_key)
+    if cached is not None:
+        price_data = frame_from_bytes(cached)
+        # Cache key ignores symbol order; restore the order the user entered
+        price_data = price_data[sorted(price_data.columns, key=symbols.index)]
+    else:
         try:
             dl = DataLoader(source_url=None, start_date=start_date, end_date=end_date)
-            dl.load(symbols)
-            dl.clean()
+            dl.load(symbols, interval=interval)
             dl.filter_dates()
             price_data = dl.get_data()
+            payload = frame_to_bytes(price_data)
+            cache.set(cache_key, payload, app.config['PRICE_CACHE_TTL'])
+            cache.set("stale:" + cache_key, payload, app.config['PRICE_CACHE_STALE_TTL'])
         except Exception as e:
-            rich_print(f"[bold red]Data loading error:[/bold red] {e}")
-            flash(f"Data loading error: {e}", "error")
-            return redirect(url_for('main', error=str(e)))
-
-        # Run PortfolioOptimizer
-        try:
-            po = PortfolioOptimizer(price_data, num_portfolios=num_portfolios, risk_free_rate=risk_free_rate)
-            po.run_simulation()
-            metrics = po.get_metrics_df()
-            optimal = po.get_optimal_portfolios()
-        except Exception as e:
-            rich_print(f"[bold red]Optimization error:[/bold red] {e}")
-            flash(f"Optimization error: {e}", "error")
-            return redirect(url_for('main', error=str(e)))
-
-        # Store only minimal user input in session if needed
-        session['last_inputs'] = dict(symbols=symbols, start_date=start_date, end_date=end_date, num_portfolios=num_portfolios, risk_free_rate=risk_free_rate)
-
-        # Generate Bokeh HTML output
-        layout = combined_layout(metrics, optimal, price_data=price_data)
-        output_path = os.path.join(os.getcwd(), 'output.html')
-        output_file(output_path, title="Portfolio Optimization Results")
-        save(layout)
-        return redirect(url_for('results'))
-
-    @app.route("/results", methods=["GET"])
-    def results():
-        from flask import send_file
-        import os
-        output_path = os.path.join(os.getcwd(), 'output.html')
-        if not os.path.exists(output_path):
-            return "No results available. Please run an optimization first.", 404
-        return send_file(output_path, mimetype='text/html', as_attachment=False)
-
-    return app
+            stale = cache.get("stale:" + cache_key)
+            if stale is None:
+                print(f"[bold red]Data loading error:[/bold red] {e}")
+                flash(f"Data loading error: {e}", "error")
+                return redirect(url_for('main', error=str(e)))
+            print(f"[bold yellow]Data loading error, serving cached prices:[/bold yellow] {e}")
+            price_data = frame_from_bytes(stale)
+            price_data = price_data[sorted(price_data.columns, key=symbols.index)]
+
+    # Run PortfolioOptimizer
+    try:
+        po = PortfolioOptimizer(price_data, num_portfolios=num_portfolios, risk_free_rate=risk_free_rate)
+        po.run_simulation()
+        metrics = po.get_metrics_df()
+        optimal = po.get_optimal_portfolios()
+    except Exception as e:
+        print(f"[bold red]Optimization error:[/bold red] {e}")
+        flash(f"Optimization error: {e}", "error")
+        return redirect(url_for('main', error=str(e)))
+
+    # Render Bokeh HTML in memory and store it under a per-run token
+    layout = combined_layout(metrics, optimal, price_data=price_data)
+    resources = INLINE if app.config['BOKEH_RESOURCES'] == 'inline' else CDN
+    html = file_html(layout, resources, "Portfolio Optimization Results")
+    token = secrets.token_urlsafe(16)
+    cache.set(f"report:{token}", html.encode('utf-8'), app.config['REPORT_TTL'])
+    # Compact result summary (a few hundred frontier points plus the optimal portfolios)
+    # lives in the cache next to the report; the session cookie carries only the token
+    summary = dict(frontier=po.get_frontier_points(max_points=200), optimal=optimal)
+    cache.set(f"summary:{token}", json.dumps(summary).encode('utf-8'), app.config['REPORT_TTL'])
+
+    # Store only minimal user input and the result token in session
+    session['last_inputs'] = dict(symbols=symbols, start_date=start_date, end_date=end_date, num_portfolios=num_portfolios, risk_free_rate=risk_free_rate)
+    session['last_token'] = token
+    return redirect(url_for('results', token=token))
+
+@app.route("/results/<token>", methods=["GET"])
+def results(token):
+    html = cache.get(f"report:{token}")
+    if html is None:
+        return "No results available. Please run an optimization first.", 404
+    return Response(html, mimetype='text/html')
+
+@app.route("/results/<token>/summary", methods=["GET"])
+def results_summary(token):
+    """Efficient-frontier points and optimal portfolios for a run, as JSON."""
+    summary = cache.get(f"summary:{token}")
+    if summary is None:
+        return {"error": "No results available. Please run an optimization first."}, 404
+    return Response(summary, mimetype='application/json')
+
+@app.errorhandler(Exception)
+def handle_unexpected_error(e):
+    """
+    Turn any uncaught exception into a flashed error on the main page. Optimizer and
+    plotting errors propagate here unwrapped, so the log keeps the original traceback.
+    HTTP errors (404s and the like) are passed through unchanged; in debug mode the
+    exception is re-raised for the Werkzeug debugger, and errors on the main page itself
+    get a plain 500 rather than a redirect back to it.
+    """
+    if isinstance(e, HTTPException):
+        return e
+    if app.debug:
+        raise e
+    app.logger.exception("Unexpected error")
+    if request.endpoint == 'main':
+        return "Internal server error.", 500
+    flash(f"Unexpected error: {e}", "error")
+    return redirect(url_for('main', error=str(e)))
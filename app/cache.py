@@ -0,0 +1,131 @@
+"""
+cache.py
+Key/value cache for price data and other expensive-to-rebuild results.
+Backed by Redis when a URL is configured, otherwise by a process-local dictionary.
+Price frames are stored in a data-only NumPy format, never pickled, so a shared or
+compromised Redis cannot inject code into the web workers.
+"""
+
+import io
+import logging
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def frame_to_bytes(df: pd.DataFrame) -> bytes:
+    """
+    Serialize a price DataFrame (date index, numeric asset columns) without pickle.
+
+    Args:
+        df (pd.DataFrame): Price data with a DatetimeIndex
+    Returns:
+        bytes: .npz archive of the values, index and column names
+    """
+    buf = io.BytesIO()
+    np.savez(
+        buf,
+        values=df.to_numpy(dtype=np.float64),
+        index=df.index.to_numpy(dtype='datetime64[ns]'),
+        columns=np.array([str(c) for c in df.columns], dtype=str),
+        index_name=np.array([df.index.name or ''], dtype=str),
+    )
+    return buf.getvalue()
+
+
+def frame_from_bytes(data: bytes) -> pd.DataFrame:
+    """
+    Rebuild a DataFrame written by frame_to_bytes. Pickled objects are refused.
+
+    Args:
+        data (bytes): Output of frame_to_bytes
+    Returns:
+        pd.DataFrame: Price data with a DatetimeIndex
+    Raises:
+        ValueError: If data is not a data-only frame archive
+    """
+    with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+        index = pd.DatetimeIndex(npz['index'], name=str(npz['index_name'][0]) or None)
+        return pd.DataFrame(npz['values'], index=index, columns=npz['columns'].tolist())
+
+
+class Cache:
+    """
+    Bytes key/value store with a per-entry time-to-live.
+
+    Redis errors are logged and treated as cache misses so a cache outage never
+    fails a request. Without Redis, entries live in this process only, guarded by a
+    lock so threaded workers can share the store.
+
+    Args:
+        redis_url (str): Redis connection URL (e.g. redis://localhost:6379/0), or None
+        max_local_entries (int): Size bound for the in-process fallback store
+
+    Example:
+        >>> cache = Cache()
+        >>> cache.set('prices:abc', b'...', ttl=900)
+        >>> cache.get('prices:abc')
+        b'...'
+    """
+
+    def __init__(self, redis_url: str = None, max_local_entries: int = 256):
+        self.logger = logging.getLogger("Cache")
+        self.logger.setLevel(logging.INFO)
+        self.max_local_entries = max_local_entries
+        self._local = {}
+        self._lock = threading.Lock()
+        self.redis = None
+        if redis_url:
+            import redis
+            self.redis = redis.Redis.from_url(redis_url)
+
+    def get(self, key: str):
+        """
+        Fetch a cached value.
+
+        Args:
+            key (str): Cache key
+        Returns:
+            bytes or None: Stored value, or None on miss/expiry/backend error
+        """
+        if self.redis is not None:
+            try:
+                return self.redis.get(key)
+            except Exception as e:
+                self.logger.warning(f"Cache get failed for {key}: {e}")
+                return None
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._local.pop(key, None)
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int):
+        """
+        Store a value for ttl seconds.
+
+        Args:
+            key (str): Cache key
+            value (bytes): Value to store
+            ttl (int): Time-to-live in seconds
+        """
+        if self.redis is not None:
+            try:
+                self.redis.setex(key, ttl, value)
+            except Exception as e:
+                self.logger.warning(f"Cache set failed for {key}: {e}")
+            return
+        with self._lock:
+            now = time.monotonic()
+            if len(self._local) >= self.max_local_entries:
+                self._local = {k: v for k, v in self._local.items() if v[0] >= now}
+                while len(self._local) >= self.max_local_entries:
+                    # Evict the entry closest to expiry
+                    self._local.pop(min(self._local, key=lambda k: self._local[k][0]))
+            self._local[key] = (now + ttl, value)
@@ -6,7 +6,9 @@ Integrates vnstock and supports loading from GitHub CSV, with robust error handl
 
 import pandas as pd
 import numpy as np
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from rich import print
 from vnstock import *  # For future API integration
 
@@ -29,6 +31,7 @@ class DataLoader:
         self.start_date = start_date
         self.end_date = end_date
         self.data = None
+        self._cleaned = False
         self.logger = logging.getLogger("DataLoader")
         self.logger.setLevel(logging.INFO)
 
@@ -57,8 +60,8 @@ class DataLoader:
             raise DataLoaderError("Start date must be before end date.")
 
         self.logger.info(f"Fetching historical price data for: {symbols}")
-        all_historical_data = {}
-        for symbol in symbols:
+
+        def _fetch_one(symbol):
             try:
                 self.logger.info(f"Processing {symbol}...")
                 quote = Quote(symbol=symbol)
@@ -68,34 +71,52 @@ class DataLoader:
                     interval=interval,
                     to_df=True
                 )
-                if not historical_data.empty:
-                    all_historical_data[symbol] = historical_data
-                    self.logger.info(f"Fetched {len(historical_data)} records for {symbol}")
-                else:
-                    self.logger.warning(f"No historical data for {symbol}")
+                return symbol, historical_data
             except Exception as e:
                 self.logger.error(f"Error fetching data for {symbol}: {e}")
                 raise DataLoaderError(f"Error fetching data for {symbol}: {e}")
-        # Combine close prices into one DataFrame
-        combined_prices = pd.DataFrame()
-        for symbol, data in all_historical_data.items():
+
+        # Requests are I/O-bound, so fetching in parallel threads cuts wall time
+        # to roughly that of the slowest single symbol.
+        with ThreadPoolExecutor(max_workers=min(len(symbols), 16)) as executor:
+            fetched = dict(executor.map(_fetch_one, symbols))
+        # Keep only the close column of each history; the full OHLCV frames are
+        # released as soon as their series is built
+        series_list = []
+        for symbol in symbols:
+            historical_data = fetched.pop(symbol, None)
+            if historical_data is None:
+                continue
+            if historical_data.empty:
+                self.logger.warning(f"No historical data for {symbol}")
+                continue
+            self.logger.info(f"Fetched {len(historical_data)} records for {symbol}")
             try:
-                temp_df = data[['time', 'close']].copy()
-                temp_df.rename(columns={'close': symbol}, inplace=True)
-                if combined_prices.empty:
-                    combined_prices = temp_df
-                else:
-                    combined_prices = pd.merge(combined_prices, temp_df, on='time', how='outer')
+                series = pd.Series(
+                    pd.to_numeric(historical_data['close'].to_numpy(), errors='coerce'),
+                    index=pd.to_datetime(historical_data['time'].to_numpy(), format='ISO8601', cache=True),
+                    name=symbol,
+                    copy=False
+                )
+                if series.index.has_duplicates:
+                    series = series[~series.index.duplicated(keep='last')]
+                series_list.append(series)
             except Exception as e:
                 self.logger.error(f"Error combining data for {symbol}: {e}")
                 raise DataLoaderError(f"Error combining data for {symbol}: {e}")
-        if not combined_prices.empty:
+        # Reindex every series onto one sorted union index so the combined frame's
+        # columns share a single index and need no realignment downstream
+        if series_list:
             try:
-                combined_prices.rename(columns={'time': 'Date'}, inplace=True)
-                combined_prices.set_index(['Date'], inplace=True)
-                combined_prices = combined_prices.apply(pd.to_numeric, errors='coerce')
+                idx = functools.reduce(lambda a, b: a.union(b), (s.index for s in series_list))
+                if not idx.is_monotonic_increasing:
+                    idx = idx.sort_values()
+                combined_prices = pd.DataFrame({s.name: s.reindex(idx) for s in series_list}, index=idx)
+                combined_prices.index.name = 'Date'
                 combined_prices = combined_prices.dropna()
                 self.data = combined_prices
+                # Columns are already numeric and NaN-free, so clean() has nothing to do
+                self._cleaned = True
                 return self.data
             except Exception as e:
                 self.logger.error(f"Error cleaning combined price data: {e}")
@@ -107,12 +128,15 @@ class DataLoader:
         """
         Clean and format the loaded price data.
         Ensures all columns are numeric, drops NaNs, and sets index to Date.
+        No-op when the data came from load(), which already produces clean output.
         Returns:
             pd.DataFrame: Cleaned DataFrame or None
         """
         if self.data is None:
             self.logger.warning("No data to clean.")
             return None
+        if self._cleaned:
+            return self.data
         df = self.data.copy()
         try:
             df = df.apply(pd.to_numeric, errors="coerce")
@@ -120,6 +144,7 @@ class DataLoader:
             if 'Date' in df.columns:
                 df.set_index('Date', inplace=True)
             self.data = df
+            self._cleaned = True
             self.logger.info("Data cleaned and formatted.")
             return self.data
         except Exception as e:
@@ -128,7 +153,8 @@ class DataLoader:
 
     def filter_dates(self):
         """
-        Filter data by start_date and end_date.
+        Filter data by start_date and end_date (inclusive).
+        Converts the index to a sorted DatetimeIndex if needed, then slices by label.
         Updates self.data in place.
         Returns:
             pd.DataFrame: Filtered DataFrame or None
@@ -136,12 +162,16 @@ class DataLoader:
         if self.data is None:
             self.logger.warning("No data to filter.")
             return None
-        df = self.data.copy()
+        df = self.data
         try:
-            if self.start_date:
-                df = df[df.index >= self.start_date]
-            if self.end_date:
-                df = df[df.index <= self.end_date]
+            if not isinstance(df.index, pd.DatetimeIndex):
+                df = df.set_axis(pd.to_datetime(df.index, format='ISO8601', cache=True), axis=0)
+            if not df.index.is_monotonic_increasing:
+                df = df.sort_index()
+            # Label slicing on a sorted DatetimeIndex is a binary search, not a row-wise compare
+            start = pd.Timestamp(self.start_date) if self.start_date else None
+            end = pd.Timestamp(self.end_date) if self.end_date else None
+            df = df.loc[start:end]
             self.data = df
             self.logger.info(f"Data filtered by date: {self.start_date} to {self.end_date}")
             return self.data
@@ -1,19 +1,53 @@
 """
 Bokeh plot generation helpers for portfolio optimization results.
 """
+from functools import lru_cache
+from math import pi
+
+import numpy as np
 from bokeh.plotting import figure
-from bokeh.layouts import column
-from bokeh.models import ColorBar, LinearColorMapper, BasicTicker
-from bokeh.transform import linear_cmap
-from bokeh.palettes import Viridis256
+from bokeh.layouts import row, column
+from bokeh.models import ColorBar, BasicTicker, ColumnDataSource, FixedTicker, Legend
+from bokeh.transform import linear_cmap, cumsum
+from bokeh.palettes import Viridis256, Category10, Category20
 
+__all__ = ['efficient_frontier_plot', 'weights_pie_chart', 'optimal_weights_pie_chart', 'plot_price_history',
+           'combined_layout']
 
-def efficient_frontier_plot(df, optimal):
+
+def _frontier_sample_idx(risk, ret, max_points, seed=42):
+    """
+    Pick row indices to plot: every point on the efficient (upper-left) envelope plus
+    a random sample of the remaining portfolios, capped at roughly max_points.
+    Args:
+        risk (np.ndarray): Portfolio volatilities
+        ret (np.ndarray): Portfolio returns
+        max_points (int): Target number of interior points to keep
+        seed (int): Seed for the interior sample
+    Returns:
+        np.ndarray: Sorted unique row indices
+    """
+    n = len(risk)
+    if n <= max_points:
+        return np.arange(n)
+    # Walking in order of increasing risk, a portfolio is on the envelope when its
+    # return beats every lower-risk portfolio seen so far
+    order = np.argsort(risk, kind='stable')
+    sorted_ret = ret[order]
+    prev_best = np.maximum.accumulate(np.concatenate(([-np.inf], sorted_ret[:-1])))
+    envelope = order[sorted_ret > prev_best]
+    sample = np.random.default_rng(seed).choice(n, size=max_points, replace=False)
+    return np.union1d(envelope, sample)
+
+
+def efficient_frontier_plot(df, optimal, max_points=2000):
     """
     Create efficient frontier scatter plot with Sharpe ratio coloring and optimal points highlighted.
+    Large simulations are downsampled to the efficient envelope plus a random interior sample.
     Args:
         df (pd.DataFrame): Portfolio metrics DataFrame
         optimal (dict): Dict of optimal portfolios
+        max_points (int): Approximate cap on scatter points sent to the browser
     Returns:
         bokeh.plotting.Figure
     """
@@ -21,7 +55,11 @@ def efficient_frontier_plot(df, optimal):
                         low=df['Sharpe'].min(), high=df['Sharpe'].max())
     p = figure(title="Efficient Frontier", x_axis_label="Risk (Volatility)", y_axis_label="Return",
                width=600, height=400, tools="pan,wheel_zoom,box_zoom,reset,save")
-    p.scatter('Risk', 'Return', source=df, color=mapper, size=6, legend_label="Portfolios", alpha=0.6)
+    # Ship only the plotted columns; weight columns would otherwise be serialized too
+    cols = {k: df[k].to_numpy() for k in ('Risk', 'Return', 'Sharpe')}
+    idx = _frontier_sample_idx(cols['Risk'], cols['Return'], max_points)
+    source = ColumnDataSource({k: v[idx] for k, v in cols.items()})
+    p.scatter('Risk', 'Return', source=source, color=mapper, size=6, legend_label="Portfolios", alpha=0.6)
 
     # Highlight optimal portfolios
     for label, color in zip(['max_sharpe', 'min_variance', 'max_return'], ['red', 'blue', 'green']):
@@ -34,10 +72,12 @@ def efficient_frontier_plot(df, optimal):
     p.legend.click_policy = "hide"
     return p
 
-from bokeh.transform import cumsum
-from math import pi
-from bokeh.palettes import Category20
-from bokeh.models import ColumnDataSource
+
+@lru_cache(maxsize=64)
+def _palette(n):
+    """Category20 colors for n slices, repeating the palette when n > 20."""
+    return tuple(Category20[min(max(n, 3), 20)] * ((n + 19) // 20))[:n]
+
 
 def weights_pie_chart(weights_dict, asset_names, label, width=600):
     """
@@ -49,12 +89,12 @@ def weights_pie_chart(weights_dict, asset_names, label, width=600):
     Returns:
         bokeh.plotting.Figure
     """
-    weights = [weights_dict[name] for name in asset_names]
+    weights = np.fromiter((weights_dict[name] for name in asset_names), dtype=np.float64, count=len(asset_names))
     data = {
         'asset': asset_names,
         'weight': weights,
-        'angle': [w * 2 * pi for w in weights],
-        'color': Category20[len(asset_names)] if len(asset_names) <= 20 else Category20[20] * (len(asset_names) // 20 + 1)
+        'angle': weights * (2 * pi),
+        'color': list(_palette(len(asset_names)))
     }
     source = ColumnDataSource(data)
     p = figure(height=400, width=width, title=f"{label} Portfolio Weights (Pie Chart)", toolbar_location=None,
@@ -67,6 +107,51 @@ def weights_pie_chart(weights_dict, asset_names, label, width=600):
     return p
 
 
+def optimal_weights_pie_chart(optimal, asset_names, width=800,
+                              labels=(('max_sharpe', 'Max Sharpe'), ('min_variance', 'Min Variance'),
+                                      ('max_return', 'Max Return'))):
+    """
+    Draw the asset weights of several optimal portfolios as side-by-side pies in one figure.
+    All wedges come from a single ColumnDataSource, so the document carries one set of
+    axes, tools and legend instead of one per portfolio.
+    Args:
+        optimal (dict): Dict of optimal portfolios
+        asset_names (list): List of asset names
+        width (int): Figure width in pixels
+        labels (tuple): (key in optimal, display label) pairs, one pie each, left to right
+    Returns:
+        bokeh.plotting.Figure
+    """
+    k = len(asset_names)
+    weights = np.array([[optimal[key][name] for name in asset_names] for key, _ in labels], dtype=np.float64)
+    # Start/end angles accumulate within each portfolio's row only
+    end_angle = np.cumsum(weights * (2 * pi), axis=1)
+    start_angle = end_angle - weights * (2 * pi)
+    source = ColumnDataSource({
+        'portfolio': [label for _, label in labels for _ in range(k)],
+        'asset': asset_names * len(labels),
+        'weight': weights.ravel(),
+        'start': start_angle.ravel(),
+        'end': end_angle.ravel(),
+        'x': np.repeat(np.arange(len(labels), dtype=np.float64), k),
+        'color': list(_palette(k)) * len(labels),
+    })
+    p = figure(height=320, width=width, title="Optimal Portfolio Weights (Pie Charts)", toolbar_location=None,
+               tools="hover", tooltips="@portfolio - @asset: @weight{0.00%}",
+               x_range=(-0.5, len(labels) - 0.5), y_range=(-0.5, 0.5))
+    # Legend outside the plot area; legend_field below fills it with one entry per asset
+    p.add_layout(Legend(), 'right')
+    p.wedge(x='x', y=0, radius=0.4, start_angle='start', end_angle='end',
+            line_color="white", fill_color='color', legend_field='asset', source=source)
+    p.xaxis.ticker = FixedTicker(ticks=list(range(len(labels))))
+    p.xaxis.major_label_overrides = {i: label for i, (_, label) in enumerate(labels)}
+    p.xaxis.major_tick_line_color = None
+    p.xaxis.axis_line_color = None
+    p.yaxis.visible = False
+    p.grid.grid_line_color = None
+    return p
+
+
 def plot_price_history(df, max_sharpe_weights=None):
     """
     Plot the historical price series for each asset, and optionally the max Sharpe portfolio price line.
@@ -76,33 +161,36 @@ def plot_price_history(df, max_sharpe_weights=None):
     Returns:
         bokeh.plotting.Figure
     """
-    from bokeh.plotting import figure
-    import numpy as np
     p = figure(title="Asset Price History", x_axis_label="Date", y_axis_label="Price",
                width=800, height=300, x_axis_type='auto')
     # Only plot asset columns (exclude metrics)
     asset_names = [name for name in df.columns if name not in ['Return', 'Risk', 'Sharpe']]
-    from bokeh.palettes import Category10
     palette = Category10[10] if len(asset_names) <= 10 else Category10[10] * (len(asset_names) // 10 + 1)
-    for i, asset in enumerate(asset_names):
-        if asset in df:
-            p.line(df.index, df[asset], legend_label=asset, color=palette[i])
+    prices = df[asset_names].to_numpy(dtype=np.float64, copy=False)
+    # One source shared by every line: the date axis is serialized once, and ndarray
+    # columns go out as Bokeh's binary buffers rather than per-element JSON numbers
+    data = {'_date': df.index.values}
+    data.update({asset: prices[:, i] for i, asset in enumerate(asset_names)})
     # Add max Sharpe portfolio price line if weights provided
     if max_sharpe_weights is not None:
-        weights = np.array([max_sharpe_weights[name] for name in asset_names])
-        portfolio_price = (df[asset_names] * weights).sum(axis=1)
-        p.line(df.index, portfolio_price, legend_label='Max Sharpe Portfolio', color='black', line_width=3, line_dash='dashed')
+        weights = np.array([max_sharpe_weights[name] for name in asset_names], dtype=np.float64)
+        data['_max_sharpe'] = prices @ weights  # Single BLAS matrix-vector product
+    source = ColumnDataSource(data)
+    for i, asset in enumerate(asset_names):
+        p.line('_date', asset, source=source, legend_label=asset, color=palette[i])
+    if max_sharpe_weights is not None:
+        p.line('_date', '_max_sharpe', source=source, legend_label='Max Sharpe Portfolio', color='black',
+               line_width=3, line_dash='dashed')
     p.legend.location = "top_left"
     p.legend.click_policy = "hide"
     return p
 
 
-
 def combined_layout(df, optimal, price_data=None):
     """
     Combine all plots into a 2x2 grid layout for output.
     Col 1: Efficient frontier
-    Col 2: Price history line chart on top, three pie charts horizontally below
+    Col 2: Price history line chart on top, optimal portfolio pie charts below
     Args:
         df (pd.DataFrame): Portfolio metrics DataFrame
         optimal (dict): Dict of optimal portfolios
@@ -110,7 +198,6 @@ def combined_layout(df, optimal, price_data=None):
     Returns:
         bokeh.layouts.LayoutDOM
     """
-    from bokeh.layouts import row, column
     asset_names = [name for name in df.columns if name not in ['Return', 'Risk', 'Sharpe']]
     frontier = efficient_frontier_plot(df, optimal)
     max_sharpe_weights = None
@@ -118,10 +205,6 @@ def combined_layout(df, optimal, price_data=None):
         # Extract only weights for asset columns
         max_sharpe_weights = {k: v for k, v in optimal['max_sharpe'].items() if k in asset_names}
     price_chart = plot_price_history(price_data if price_data is not None else df, max_sharpe_weights=max_sharpe_weights)
-    pie_chart_width = 266  # 800px (line chart width) / 3
-    pie_max_sharpe = weights_pie_chart(optimal['max_sharpe'], asset_names, 'Max Sharpe', width=pie_chart_width)
-    pie_min_var = weights_pie_chart(optimal['min_variance'], asset_names, 'Min Variance', width=pie_chart_width)
-    pie_max_return = weights_pie_chart(optimal['max_return'], asset_names, 'Max Return', width=pie_chart_width)
-    pie_row = row(pie_max_sharpe, pie_min_var, pie_max_return)
-    right_column = column(price_chart, pie_row)
+    pie_chart = optimal_weights_pie_chart(optimal, asset_names, width=800)  # Matches line chart width
+    right_column = column(price_chart, pie_chart)
     return row(frontier, right_column)
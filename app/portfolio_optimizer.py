@@ -12,9 +12,10 @@ Key Classes:
 
 Assumptions & Limitations:
     - Input price_data must be a cleaned DataFrame (date index, asset columns, no NaNs)
-    - Uses log returns and annualizes with 252 trading days
+    - Uses log returns and annualizes with 252 trading days (annual return = exp(252 * mean daily log return) - 1)
     - Monte Carlo simulation does not guarantee global optimum; only explores random portfolios
     - Not suitable for highly illiquid or non-numeric data
+    - Uses a fused parallel Numba kernel for portfolio statistics when numba is installed
 
 Example Usage:
     >>> po = PortfolioOptimizer(price_data)
@@ -27,7 +28,97 @@ Example Usage:
 import numpy as np
 import pandas as pd
 import logging
-from rich import print
+
+logger = logging.getLogger("PortfolioOptimizer")
+logger.setLevel(logging.INFO)
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; the NumPy path below is used without it
+    njit = None
+
+
+def _portfolio_stats(weights, mean_ret, cov_matrix, risk_free_rate):
+    """
+    Annualized return, volatility and Sharpe ratio for each row of a weight matrix (NumPy path).
+
+    Args:
+        weights (np.ndarray): (N, A) portfolio weights
+        mean_ret (np.ndarray): (A,) mean daily log returns
+        cov_matrix (np.ndarray): (A, A) annualized covariance of log returns
+        risk_free_rate (float): Risk-free rate for Sharpe ratio calculation
+    Returns:
+        tuple: (returns, risk, sharpe_ratio) arrays of shape (N,)
+    """
+    # mean_ret holds daily log returns, so the annual simple return is exp(252 * r) - 1
+    port_returns = np.expm1(252 * (weights @ mean_ret))
+    # W @ C dispatches to BLAS GEMM; the row-wise dot with W then gives each w.C.w
+    port_risk = np.sqrt(np.einsum('ni,ni->n', weights @ cov_matrix, weights))
+    sharpe_ratio = np.divide(port_returns - risk_free_rate, port_risk,
+                             out=np.zeros_like(port_risk), where=port_risk > 0)
+    return port_returns, port_risk, sharpe_ratio
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _portfolio_stats_numba(weights, mean_ret, cov_matrix, risk_free_rate,
+                               port_returns, port_risk, sharpe_ratio):
+        """
+        Fused, parallel equivalent of _portfolio_stats writing into preallocated outputs.
+        Each portfolio's return, w.C.w variance and Sharpe ratio are computed in one pass
+        over its weights, with no (N, A) intermediates; the quadratic form visits only the upper
+        triangle of the symmetric covariance matrix. Only used when numba is installed.
+        """
+        n, a = weights.shape
+        for k in prange(n):
+            w = weights[k]  # Row view, hoisted out of the A x A loop
+            ret = 0.0
+            var = 0.0
+            for i in range(a):
+                wi = w[i]
+                ret += wi * mean_ret[i]
+                # C is symmetric: w.C.w = sum_i w_i^2 C_ii + 2 * sum_{i<j} w_i w_j C_ij,
+                # so only the upper triangle is visited
+                row = 0.0
+                for j in range(i + 1, a):
+                    row += cov_matrix[i, j] * w[j]
+                var += wi * (cov_matrix[i, i] * wi + 2.0 * row)
+            ret = np.expm1(252.0 * ret)
+            sd = np.sqrt(var)
+            port_returns[k] = ret
+            port_risk[k] = sd
+            sharpe_ratio[k] = (ret - risk_free_rate) / sd if sd > 0 else 0.0
+
+
+def _simulate_portfolios(seed, num_portfolios, mean_ret, cov_matrix, risk_free_rate):
+    """
+    Draw num_portfolios random portfolios and evaluate them.
+
+    Args:
+        seed (int): Seed for the random generator
+        num_portfolios (int): Number of portfolios to draw
+        mean_ret (np.ndarray): (A,) float32 mean daily log returns
+        cov_matrix (np.ndarray): (A, A) float32 annualized covariance of log returns
+        risk_free_rate (float): Risk-free rate for Sharpe ratio calculation
+    Returns:
+        np.ndarray: (num_portfolios, 3 + A) float32 block; columns are return, risk,
+        Sharpe ratio, then one weight per asset
+    """
+    n_assets = len(mean_ret)
+    block = np.empty((num_portfolios, 3 + n_assets), dtype=np.float32)
+    weights = block[:, 3:]
+    # Normalized i.i.d. exponentials are Dirichlet(1, ..., 1): uniform over the simplex.
+    # Normalizing writes the weights straight into the block.
+    rng = np.random.default_rng(seed)
+    draws = rng.standard_exponential((num_portfolios, n_assets), dtype=np.float32)
+    np.divide(draws, draws.sum(axis=1, keepdims=True), out=weights)
+    if njit is not None:
+        _portfolio_stats_numba(weights, mean_ret, cov_matrix, float(risk_free_rate),
+                               block[:, 0], block[:, 1], block[:, 2])
+    else:
+        block[:, 0], block[:, 1], block[:, 2] = _portfolio_stats(weights, mean_ret, cov_matrix, risk_free_rate)
+    return block
+
 
 class PortfolioOptimizerError(Exception):
     """Custom exception for PortfolioOptimizer errors."""
@@ -61,16 +152,58 @@ class PortfolioOptimizer:
         self.price_data = price_data
         self.num_portfolios = num_portfolios
         self.risk_free_rate = risk_free_rate
-        self.logger = logging.getLogger("PortfolioOptimizer")
-        self.logger.setLevel(logging.INFO)
+        self.logger = logger
         self.results = None
+        self._block = None
+        self._metrics_df = None
+        self._stats = None
+        self._stats_source = None
+
+    def set_price_data(self, price_data: pd.DataFrame):
+        """
+        Replace the price data and drop statistics and results derived from the old data.
+
+        Args:
+            price_data (pd.DataFrame): Cleaned price data (date index, asset columns)
+        """
+        self.price_data = price_data
+        self._stats = None
+        self._stats_source = None
+        self.results = None
+        self._block = None
+        self._metrics_df = None
+
+    def _price_stats(self):
+        """
+        Mean daily log returns and annualized covariance of self.price_data.
+
+        Computed once and reused by later run_simulation calls (e.g. with a different
+        num_portfolios or risk_free_rate); recomputed if price_data is reassigned.
+        Returns:
+            tuple: (mean_ret, cov_matrix) float32 arrays of shape (A,) and (A, A)
+        """
+        if self._stats is None or self._stats_source is not self.price_data:
+            # Work on the raw ndarray: one log pass, then consecutive differences
+            # (log(p_t / p_t-1) = log p_t - log p_t-1); no shifted copy and no NaN first row
+            prices = self.price_data.to_numpy(dtype=np.float64)
+            log_ret = np.diff(np.log(prices), axis=0)
+            mean_ret = log_ret.mean(axis=0).astype(np.float32)
+            cov_matrix = (np.atleast_2d(np.cov(log_ret, rowvar=False, ddof=1)) * 252).astype(np.float32)
+            self._stats = (mean_ret, cov_matrix)
+            self._stats_source = self.price_data
+        return self._stats
 
     def run_simulation(self):
         """
         Run Monte Carlo simulation to generate random portfolios and calculate returns and risk.
         Populates self.results with all weights, returns, risk, and Sharpe ratios.
+
+        Log returns and their covariance are computed in float64; the simulated weights and
+        metrics are float32, which is ample for ranking and plotting portfolios and halves
+        memory traffic and results size. Metrics and weights share one (N, 3 + A) block,
+        which get_metrics_df wraps without copying.
         Returns:
-            dict: Results containing weights, returns, risk, Sharpe ratios
+            dict: Results containing weights, returns, risk, Sharpe ratios (float32 arrays)
         Raises:
             PortfolioOptimizerError: If input data is invalid or calculation fails
         """
@@ -78,31 +211,18 @@ class PortfolioOptimizer:
             if self.price_data is None or not isinstance(self.price_data, pd.DataFrame) or self.price_data.empty:
                 self.logger.error("Invalid or empty price data for optimization.")
                 raise PortfolioOptimizerError("Invalid or empty price data for optimization.")
-            num_assets = self.price_data.shape[1]
-            log_ret = np.log(self.price_data / self.price_data.shift(1))
-            cov_matrix = log_ret.cov() * 252
-            all_wts = np.zeros((self.num_portfolios, num_assets))
-            port_returns = np.zeros(self.num_portfolios)
-            port_risk = np.zeros(self.num_portfolios)
-            sharpe_ratio = np.zeros(self.num_portfolios)
-            np.random.seed(42)
-            for i in range(self.num_portfolios):
-                wts = np.random.uniform(size=num_assets)
-                wts = wts / np.sum(wts)
-                all_wts[i, :] = wts
-                port_ret = np.sum(log_ret.mean() * wts)
-                port_ret = (port_ret + 1) ** 252 - 1
-                port_returns[i] = port_ret
-                port_sd = np.sqrt(np.dot(wts.T, np.dot(cov_matrix, wts)))
-                port_risk[i] = port_sd
-                sr = (port_ret - self.risk_free_rate) / port_sd if port_sd > 0 else 0.0
-                sharpe_ratio[i] = sr
+            mean_ret, cov_matrix = self._price_stats()
+            # Draw and evaluate all portfolios at once: (N, A) weights, one row per portfolio
+            block = _simulate_portfolios(42, self.num_portfolios, mean_ret, cov_matrix, self.risk_free_rate)
+            # The block is the only storage; the result arrays are views of its columns
+            self._block = block
             self.results = {
-                'weights': all_wts,
-                'returns': port_returns,
-                'risk': port_risk,
-                'sharpe_ratio': sharpe_ratio
+                'weights': block[:, 3:],
+                'returns': block[:, 0],
+                'risk': block[:, 1],
+                'sharpe_ratio': block[:, 2]
             }
+            self._metrics_df = None
             self.logger.info(f"Simulation complete: {self.num_portfolios} portfolios simulated.")
             return self.results
         except Exception as e:
@@ -112,28 +232,21 @@ class PortfolioOptimizer:
     def get_metrics_df(self) -> pd.DataFrame:
         """
         Return a DataFrame of portfolio metrics: returns, risk, Sharpe ratio, and weights.
+        Built once per simulation and cached; treat it as read-only.
         Returns:
             pd.DataFrame: Each row is a portfolio; columns are metrics and weights
         Raises:
-            PortfolioOptimizerError: If simulation has not been run or fails
+            PortfolioOptimizerError: If simulation has not been run
         """
-        try:
-            if self.results is None:
-                self.logger.error("Simulation not run. Call run_simulation() first.")
-                raise PortfolioOptimizerError("Simulation not run. Call run_simulation() first.")
-            num_assets = self.price_data.shape[1]
-            columns = ['Return', 'Risk', 'Sharpe'] + list(self.price_data.columns)
-            data = np.concatenate([
-                self.results['returns'].reshape(-1, 1),
-                self.results['risk'].reshape(-1, 1),
-                self.results['sharpe_ratio'].reshape(-1, 1),
-                self.results['weights']
-            ], axis=1)
-            df = pd.DataFrame(data, columns=columns)
-            return df
-        except Exception as e:
-            self.logger.error(f"Error in get_metrics_df: {e}")
-            raise PortfolioOptimizerError(f"Error in get_metrics_df: {e}")
+        if self.results is None:
+            self.logger.error("Simulation not run. Call run_simulation() first.")
+            raise PortfolioOptimizerError("Simulation not run. Call run_simulation() first.")
+        if self._metrics_df is not None:
+            return self._metrics_df
+        # The simulation block already has the metrics column layout; wrap it without copying
+        columns = ['Return', 'Risk', 'Sharpe'] + list(self.price_data.columns)
+        self._metrics_df = pd.DataFrame(self._block, columns=columns, copy=False)
+        return self._metrics_df
 
     def get_optimal_portfolios(self):
         """
@@ -141,39 +254,76 @@ class PortfolioOptimizer:
         Returns:
             dict: {'max_sharpe': {...}, 'min_variance': {...}, 'max_return': {...}}
         Raises:
-            PortfolioOptimizerError: If simulation has not been run or fails
+            PortfolioOptimizerError: If simulation has not been run
         """
-        try:
-            df = self.get_metrics_df()
-            max_sharpe_idx = df['Sharpe'].idxmax()
-            min_var_idx = df['Risk'].idxmin()
-            max_ret_idx = df['Return'].idxmax()
+        if self.results is None:
+            self.logger.error("Simulation not run. Call run_simulation() first.")
+            raise PortfolioOptimizerError("Simulation not run. Call run_simulation() first.")
+        r = self.results
+        asset_names = list(self.price_data.columns)
+
+        def portfolio(i):
             return {
-                'max_sharpe': df.loc[max_sharpe_idx].to_dict(),
-                'min_variance': df.loc[min_var_idx].to_dict(),
-                'max_return': df.loc[max_ret_idx].to_dict()
+                'Return': float(r['returns'][i]),
+                'Risk': float(r['risk'][i]),
+                'Sharpe': float(r['sharpe_ratio'][i]),
+                **dict(zip(asset_names, r['weights'][i].tolist()))
             }
-        except Exception as e:
-            self.logger.error(f"Error in get_optimal_portfolios: {e}")
-            raise PortfolioOptimizerError(f"Error in get_optimal_portfolios: {e}")
+
+        # Pick rows straight from the result arrays; no metrics DataFrame is needed
+        return {
+            'max_sharpe': portfolio(int(np.argmax(r['sharpe_ratio']))),
+            'min_variance': portfolio(int(np.argmin(r['risk']))),
+            'max_return': portfolio(int(np.argmax(r['returns'])))
+        }
+
+    def get_frontier_points(self, max_points: int = 200):
+        """
+        Compact efficient-frontier summary: the simulated portfolios are bucketed into
+        max_points equal-width risk bands and the highest-return portfolio of each band is kept.
+        Small enough to store per user (e.g. in the Flask session) instead of the full metrics.
+        Args:
+            max_points (int): Maximum number of frontier points
+        Returns:
+            dict: {'Risk': [...], 'Return': [...], 'Sharpe': [...]} lists ordered by increasing risk
+        Raises:
+            PortfolioOptimizerError: If simulation has not been run
+        """
+        if self.results is None:
+            self.logger.error("Simulation not run. Call run_simulation() first.")
+            raise PortfolioOptimizerError("Simulation not run. Call run_simulation() first.")
+        r = self.results
+        risk, ret = r['risk'], r['returns']
+        lo, span = float(risk.min()), float(risk.max() - risk.min())
+        if span > 0:
+            bucket = np.minimum(((risk - lo) / span * max_points).astype(np.intp), max_points - 1)
+        else:
+            bucket = np.zeros(len(risk), dtype=np.intp)
+        # Sort by bucket, then by descending return; the first row of each bucket is its best
+        order = np.lexsort((-ret, bucket))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = bucket[order][1:] != bucket[order][:-1]
+        idx = order[first]
+        return {
+            'Risk': risk[idx].tolist(),
+            'Return': ret[idx].tolist(),
+            'Sharpe': r['sharpe_ratio'][idx].tolist()
+        }
 
     def get_visualization_data(self):
         """
         Prepare all results for visualization (metrics DataFrame, optimal portfolios, raw arrays).
+        The returned objects share memory with the optimizer's results; do not modify them.
         Returns:
             dict: {'metrics_df': DataFrame, 'optimal': dict, 'raw': dict}
         Raises:
-            PortfolioOptimizerError: If simulation not run or fails
+            PortfolioOptimizerError: If simulation has not been run
         """
-        try:
-            metrics_df = self.get_metrics_df()
-            optimal = self.get_optimal_portfolios()
-            raw = self.results.copy() if self.results else None
-            return {
-                'metrics_df': metrics_df,
-                'optimal': optimal,
-                'raw': raw
-            }
-        except Exception as e:
-            self.logger.error(f"Error in get_visualization_data: {e}")
-            raise PortfolioOptimizerError(f"Error in get_visualization_data: {e}")
+        metrics_df = self.get_metrics_df()
+        optimal = self.get_optimal_portfolios()
+        raw = self.results  # Shared, read-only view of the simulation arrays
+        return {
+            'metrics_df': metrics_df,
+            'optimal': optimal,
+            'raw': raw
+        }
@@ -0,0 +1,73 @@
+"""
+gunicorn_conf.py
+Production gunicorn settings for the Portfolio Optimizer.
+
+Usage:
+    gunicorn -c gunicorn_conf.py "app:create_app()"
+
+Set GUNICORN_BIND=unix:/tmp/flaskmpt.sock to serve behind nginx over a unix socket.
+"""
+
+import math
+import os
+
+
+def _available_cpus():
+    """
+    CPUs this process may actually use: the affinity mask, capped by the cgroup CPU quota.
+    os.cpu_count() reports the host's cores, which overstates what a container gets.
+    Returns:
+        int: Number of usable CPUs (at least 1)
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS/Windows
+        cpus = os.cpu_count() or 1
+    quota_files = [
+        ('/sys/fs/cgroup/cpu.max', None),  # cgroup v2: "<quota> <period>" or "max <period>"
+        ('/sys/fs/cgroup/cpu/cpu.cfs_quota_us', '/sys/fs/cgroup/cpu/cpu.cfs_period_us'),  # cgroup v1
+    ]
+    for quota_path, period_path in quota_files:
+        try:
+            with open(quota_path) as f:
+                fields = f.read().split()
+            if period_path is not None:
+                with open(period_path) as f:
+                    fields.append(f.read().strip())
+            quota, period = fields[0], fields[1]
+            if quota not in ('max', '-1'):
+                cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+            break
+        except (OSError, ValueError, IndexError):
+            continue
+    return cpus
+
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '5000')}")
+# Reports and cached prices live in Redis when REDIS_URL is set; otherwise they are held in
+# each worker's memory, and /results/<token> only resolves if one process serves every request.
+# With Redis, scale with the cores the container is allowed to use.
+if os.getenv('WEB_CONCURRENCY'):
+    workers = int(os.getenv('WEB_CONCURRENCY'))
+elif os.getenv('REDIS_URL'):
+    workers = 2 * _available_cpus() + 1
+else:
+    workers = 1
+worker_class = "gthread"
+threads = int(os.getenv('GUNICORN_THREADS', 2))
+keepalive = 5
+timeout = 120
+# Import pandas/bokeh once in the master and share pages with workers via copy-on-write
+preload_app = True
+
+
+def on_starting(server):
+    """
+    Refuse to start several workers without Redis: each would keep its own in-process
+    cache, and /results/<token> would 404 whenever the redirect reached another worker.
+    """
+    if server.cfg.workers > 1 and not os.getenv('REDIS_URL'):
+        raise RuntimeError(
+            f"{server.cfg.workers} workers configured without REDIS_URL; results pages are "
+            "stored per process. Set REDIS_URL or run a single worker (WEB_CONCURRENCY=1)."
+        )
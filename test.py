@@ -42,27 +42,20 @@ def load_stock_data(symbols, start_date, end_date, interval='1D'):
         except Exception as e:
             print(f"Error fetching data for {symbol}: {e}")
     
-    # Create a combined DataFrame for close prices
-    combined_prices = pd.DataFrame()
+    # Collect one close-price series per symbol and align them in a single outer join
+    series_list = []
     
     for symbol, data in all_historical_data.items():
-        if not historical_data.empty:
-            # Extract time and close price
-            temp_df = data[['time', 'close']].copy()
-            temp_df.rename(columns={'close': symbol}, inplace=True)
-            
-            if combined_prices.empty:
-                combined_prices = temp_df
-            else:
-                combined_prices = pd.merge(combined_prices, temp_df, on='time', how='outer')
+        if not data.empty:
+            series_list.append(data.set_index('time')['close'].rename(symbol))
     
     # Clean and format data for optimization
-    if not combined_prices.empty:
-        combined_prices.rename(columns={'time': 'Date'}, inplace=True)
-        combined_prices.set_index(['Date'], inplace=True)
+    if series_list:
+        combined_prices = pd.concat(series_list, axis=1, join='outer').sort_index()
+        combined_prices.index.name = 'Date'
         combined_prices = combined_prices.apply(pd.to_numeric, errors='coerce')
         combined_prices = combined_prices.dropna()
         
         return combined_prices
     
-    return None
\ No newline at end of file
+    return None
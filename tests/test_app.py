@@ -3,13 +3,16 @@ Integration tests for Flask portfolio optimizer app.
 Uses pytest and Flask test client.
 """
 import pytest
+import pandas as pd
 from flask import session
 from app import create_app
+from app.cache import frame_to_bytes
 
 @pytest.fixture
 def client():
     app = create_app()
     app.config['TESTING'] = True
+    app.config['DEBUG'] = False  # Error-handler tests need the non-debug path
     app.config['SECRET_KEY'] = 'test-key'
     with app.test_client() as client:
         with app.app_context():
@@ -72,10 +75,10 @@ def test_session_storage(client, monkeypatch):
     # Patch DataLoader and PortfolioOptimizer to skip real computation
     class DummyDL:
         def __init__(self, **kwargs): pass
-        def load(self, symbols): pass
+        def load(self, symbols, interval='1D'): pass
         def clean(self): pass
         def filter_dates(self): pass
-        def get_data(self): return {'dummy': [1,2,3]}
+        def get_data(self): return pd.DataFrame({'AAA': [1.0, 2.0, 3.0]})
     class DummyPO:
         def __init__(self, *a, **k): pass
         def run_simulation(self): pass
@@ -84,8 +87,10 @@ def test_session_storage(client, monkeypatch):
             return pd.DataFrame({'Return':[0.1], 'Risk':[0.2], 'Sharpe':[1.5], 'AAA':[1.0]})
         def get_optimal_portfolios(self):
             return {'max_sharpe': {'Risk':0.2, 'Return':0.1, 'AAA':1.0}, 'min_variance': {'Risk':0.2, 'Return':0.1, 'AAA':1.0}, 'max_return': {'Risk':0.2, 'Return':0.1, 'AAA':1.0}}
-    monkeypatch.setattr('app.data_loader.DataLoader', DummyDL)
-    monkeypatch.setattr('app.portfolio_optimizer.PortfolioOptimizer', DummyPO)
+        def get_frontier_points(self, max_points=200):
+            return {'Risk':[0.2], 'Return':[0.1], 'Sharpe':[1.5]}
+    monkeypatch.setattr('app.DataLoader', DummyDL)
+    monkeypatch.setattr('app.PortfolioOptimizer', DummyPO)
     data = {
         'symbols': 'AAA',
         'start_date': '2024-01-01',
@@ -95,11 +100,73 @@ def test_session_storage(client, monkeypatch):
     }
     with client.session_transaction() as sess:
         sess.clear()
-    resp = client.post('/optimize', data=data)
+    resp = client.post('/optimize', data=data, follow_redirects=True)
     # Should return HTML file
     assert resp.status_code == 200
     assert b'Portfolio Optimization Results' in resp.data
-    # Session should store last_metrics_csv and last_inputs
+    # Session should store only last_inputs and the result token; the summary is in the cache
     with client.session_transaction() as sess:
-        assert 'last_metrics_csv' in sess
+        assert 'last_metrics_csv' not in sess
         assert 'last_inputs' in sess
+        token = sess['last_token']
+    resp = client.get(f'/results/{token}/summary')
+    assert resp.status_code == 200
+    assert resp.mimetype == 'application/json'
+    summary = resp.get_json()
+    assert summary['frontier']['Risk'] == [0.2]
+    assert 'max_sharpe' in summary['optimal']
+
+def test_results_unknown_token(client):
+    resp = client.get('/results/not-a-real-token')
+    assert resp.status_code == 404
+    resp = client.get('/results/not-a-real-token/summary')
+    assert resp.status_code == 404
+
+def test_invalid_input_skips_data_loading(client, monkeypatch):
+    class FailingDL:
+        def __init__(self, **kwargs):
+            raise AssertionError("DataLoader must not run for invalid input")
+    monkeypatch.setattr('app.DataLoader', FailingDL)
+    import app as app_module
+    monkeypatch.setattr(app_module.cache, 'get', lambda key: pytest.fail("cache must not be queried"))
+    data = {
+        'symbols': 'AAA, bad symbol!',
+        'start_date': '2024-01-01',
+        'end_date': '2024-04-01',
+        'num_portfolios': '5000',
+        'risk_free_rate': '0.0',
+    }
+    resp = client.post('/optimize', data=data, follow_redirects=True)
+    assert resp.status_code == 200
+    assert b'Invalid symbol(s) detected.' in resp.data
+
+def test_unexpected_error_redirects_with_message(client, monkeypatch):
+    import app as app_module
+    monkeypatch.setattr(app_module.cache, 'get', lambda key: frame_to_bytes(pd.DataFrame({'AAA': [1.0, 2.0]}, index=pd.date_range('2024-01-01', periods=2))))
+    class DummyPO:
+        def __init__(self, *a, **k): pass
+        def run_simulation(self): pass
+        def get_metrics_df(self): return pd.DataFrame({'Return': [0.1], 'Risk': [0.2], 'Sharpe': [1.5], 'AAA': [1.0]})
+        def get_optimal_portfolios(self): return {}
+        def get_frontier_points(self, max_points=200): return {'Risk': [0.2], 'Return': [0.1], 'Sharpe': [1.5]}
+    def broken_layout(*a, **k):
+        raise RuntimeError("layout failed")
+    monkeypatch.setattr('app.PortfolioOptimizer', DummyPO)
+    monkeypatch.setattr('app.combined_layout', broken_layout)
+    data = {
+        'symbols': 'AAA',
+        'start_date': '2024-01-01',
+        'end_date': '2024-04-01',
+        'num_portfolios': '5000',
+        'risk_free_rate': '0.0',
+    }
+    resp = client.post('/optimize', data=data, follow_redirects=True)
+    assert resp.status_code == 200
+    assert b'Unexpected error: layout failed' in resp.data
+
+def test_unexpected_error_on_main_page_returns_500(client, monkeypatch):
+    def broken_template(*a, **k):
+        raise RuntimeError("template failed")
+    monkeypatch.setattr('app.render_template', broken_template)
+    resp = client.get('/')
+    assert resp.status_code == 500
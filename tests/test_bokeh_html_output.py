@@ -5,7 +5,9 @@ import os
 import tempfile
 import pandas as pd
 import numpy as np
+from bokeh.embed import file_html
 from bokeh.plotting import figure, output_file, save
+from bokeh.resources import CDN
 from app.plots import combined_layout
 import pytest
 
@@ -44,3 +46,11 @@ def test_bokeh_html_output_and_serve(dummy_metrics_and_optimal):
         from mimetypes import guess_type
         mimetype, _ = guess_type(html_path)
         assert mimetype == "text/html"
+
+def test_bokeh_html_uses_cdn_resources(dummy_metrics_and_optimal):
+    df, optimal = dummy_metrics_and_optimal
+    html = file_html(combined_layout(df, optimal), CDN, "Portfolio Optimization Results")
+    assert "Portfolio Optimization Results" in html
+    assert "cdn.bokeh.org" in html
+    # BokehJS is linked, not inlined
+    assert len(html) < 500_000
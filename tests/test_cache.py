@@ -0,0 +1,64 @@
+"""
+Unit tests for Cache (in-process fallback store, expiry, size bound) and price frame serialization.
+"""
+import pickle
+import threading
+import time
+import pandas as pd
+import pytest
+from app.cache import Cache, frame_from_bytes, frame_to_bytes
+
+def test_set_and_get_roundtrip():
+    cache = Cache()
+    cache.set('prices:abc', b'payload', ttl=60)
+    assert cache.get('prices:abc') == b'payload'
+
+def test_get_missing_returns_none():
+    cache = Cache()
+    assert cache.get('prices:missing') is None
+
+def test_expired_entry_is_dropped(monkeypatch):
+    cache = Cache()
+    cache.set('prices:abc', b'payload', ttl=10)
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 11)
+    assert cache.get('prices:abc') is None
+    assert 'prices:abc' not in cache._local
+
+def test_local_store_is_bounded():
+    cache = Cache(max_local_entries=2)
+    cache.set('a', b'1', ttl=10)
+    cache.set('b', b'2', ttl=20)
+    cache.set('c', b'3', ttl=30)
+    assert len(cache._local) == 2
+    assert cache.get('a') is None
+    assert cache.get('c') == b'3'
+
+def test_local_store_is_thread_safe():
+    cache = Cache(max_local_entries=8)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(2000):
+                cache.set(f'{n}:{i}', b'x', ttl=i % 7 + 1)
+                cache.get(f'{n}:{i // 2}')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len(cache._local) <= 8
+
+def test_frame_roundtrip():
+    df = pd.DataFrame({'AAA': [1.5, 2.25], 'BBB': [10.0, 11.0]},
+                      index=pd.DatetimeIndex(['2024-01-02', '2024-01-03'], name='Date'))
+    pd.testing.assert_frame_equal(frame_from_bytes(frame_to_bytes(df)), df)
+
+def test_frame_from_bytes_rejects_pickle():
+    with pytest.raises(ValueError):
+        frame_from_bytes(pickle.dumps(pd.DataFrame({'AAA': [1.0]})))
@@ -36,6 +36,14 @@ def test_filter_dates_filters_correctly(sample_price_df):
     assert filtered.index.max() <= pd.Timestamp('2024-01-04')
     assert filtered.shape[0] == 3
 
+def test_filter_dates_parses_unsorted_string_index():
+    dl = DataLoader(source_url=None, start_date='2024-01-02', end_date='2024-01-03')
+    dl.data = pd.DataFrame({'AAA': [4.0, 1.0, 3.0, 2.0]},
+                           index=['2024-01-04', '2024-01-01', '2024-01-03', '2024-01-02'])
+    filtered = dl.filter_dates()
+    assert isinstance(filtered.index, pd.DatetimeIndex)
+    assert list(filtered['AAA']) == [2.0, 3.0]
+
 def test_get_data_raises_on_no_data():
     dl = DataLoader(source_url=None)
     with pytest.raises(DataLoaderError):
@@ -54,3 +62,42 @@ def test_filter_dates_warns_on_no_data(caplog):
         result = dl.filter_dates()
         assert result is None
         assert "No data to filter" in caplog.text
+
+class FakeQuote:
+    """Stand-in for vnstock.Quote returning canned close prices."""
+    histories = {
+        'AAA': pd.DataFrame({'time': ['2024-01-01', '2024-01-02', '2024-01-03'], 'close': [10.0, 11.0, 12.0]}),
+        'BBB': pd.DataFrame({'time': ['2024-01-02', '2024-01-03', '2024-01-04'], 'close': [20.0, 21.0, 22.0]}),
+    }
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, **kwargs):
+        return self.histories[self.symbol]
+
+def test_load_combines_symbols_on_shared_dates(monkeypatch):
+    monkeypatch.setattr('vnstock.Quote', FakeQuote)
+    dl = DataLoader(source_url=None)
+    df = dl.load(['BBB', 'AAA'])
+    assert list(df.columns) == ['BBB', 'AAA']
+    assert df.index.name == 'Date'
+    assert list(df.index) == [pd.Timestamp('2024-01-02'), pd.Timestamp('2024-01-03')]
+    assert df.loc['2024-01-03', 'AAA'] == 12.0
+
+def test_clean_is_noop_after_load(monkeypatch):
+    monkeypatch.setattr('vnstock.Quote', FakeQuote)
+    dl = DataLoader(source_url=None)
+    loaded = dl.load(['AAA', 'BBB'])
+    assert dl.clean() is loaded
+
+def test_load_keeps_last_duplicate_timestamp(monkeypatch):
+    class DuplicateQuote(FakeQuote):
+        histories = {
+            'AAA': pd.DataFrame({'time': ['2024-01-01', '2024-01-02', '2024-01-02'], 'close': [10.0, 11.0, 11.5]}),
+            'BBB': pd.DataFrame({'time': ['2024-01-01', '2024-01-02'], 'close': [20.0, 21.0]}),
+        }
+    monkeypatch.setattr('vnstock.Quote', DuplicateQuote)
+    df = DataLoader(source_url=None).load(['AAA', 'BBB'])
+    assert df.shape == (2, 2)
+    assert df.loc['2024-01-02', 'AAA'] == 11.5
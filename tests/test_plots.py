@@ -1,13 +1,16 @@
 """
-Unit tests for Bokeh visualization helpers (efficient frontier, weights bar, combined layout).
+Unit tests for Bokeh visualization helpers (efficient frontier, weights pie, combined layout).
 Covers figure creation, types, and minimal structure.
 """
 import pandas as pd
 import numpy as np
 import pytest
-from app.plots import efficient_frontier_plot, weights_bar_plot, combined_layout
+from app.plots import (
+    efficient_frontier_plot, weights_pie_chart, optimal_weights_pie_chart, plot_price_history, combined_layout,
+    _palette,
+)
 from bokeh.plotting import figure
-from bokeh.layouts import Column
+from bokeh.layouts import Column, Row
 
 FigureType = type(figure())
 
@@ -35,18 +38,67 @@ def test_efficient_frontier_plot(dummy_metrics_and_optimal):
     assert fig.xaxis[0].axis_label == "Risk (Volatility)"
     assert fig.yaxis[0].axis_label == "Return"
 
-def test_weights_bar_plot(dummy_metrics_and_optimal):
+def test_efficient_frontier_source_omits_weights(dummy_metrics_and_optimal):
+    df, optimal = dummy_metrics_and_optimal
+    fig = efficient_frontier_plot(df, optimal)
+    source = fig.renderers[0].data_source
+    assert set(source.data.keys()) == {'Risk', 'Return', 'Sharpe'}
+    assert len(source.data['Risk']) == len(df)
+
+def test_efficient_frontier_downsamples_but_keeps_envelope():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'Return': rng.random(5000), 'Risk': rng.random(5000), 'Sharpe': rng.random(5000)})
+    optimal = {k: {'Risk': 0.5, 'Return': 0.5} for k in ('max_sharpe', 'min_variance', 'max_return')}
+    fig = efficient_frontier_plot(df, optimal, max_points=500)
+    source = fig.renderers[0].data_source
+    assert len(source.data['Risk']) < 1000
+    # Lowest-risk and highest-return portfolios both sit on the envelope
+    assert df['Risk'].min() in source.data['Risk']
+    assert df['Return'].max() in source.data['Return']
+
+def test_palette_matches_asset_count():
+    assert len(_palette(2)) == 2
+    assert len(_palette(25)) == 25
+    assert _palette(25)[20] == _palette(25)[0]
+
+def test_weights_pie_chart(dummy_metrics_and_optimal):
     df, optimal = dummy_metrics_and_optimal
     asset_names = [c for c in df.columns if c not in ['Return', 'Risk', 'Sharpe']]
-    fig = weights_bar_plot(optimal, asset_names)
+    fig = weights_pie_chart(optimal['max_sharpe'], asset_names, 'Max Sharpe')
     assert isinstance(fig, FigureType)
     assert fig.title.text.startswith("Max Sharpe Portfolio Weights")
-    assert fig.x_range.factors == asset_names
+    source = fig.renderers[0].data_source
+    assert list(source.data['asset']) == asset_names
+    assert len(source.data['color']) == len(asset_names)
+
+def test_optimal_weights_pie_chart_single_source(dummy_metrics_and_optimal):
+    df, optimal = dummy_metrics_and_optimal
+    asset_names = ['AAA', 'BBB']
+    fig = optimal_weights_pie_chart(optimal, asset_names)
+    assert isinstance(fig, FigureType)
+    assert len(fig.renderers) == 1
+    data = fig.renderers[0].data_source.data
+    assert len(data['asset']) == 3 * len(asset_names)
+    assert list(data['x']) == [0, 0, 1, 1, 2, 2]
+    # Each pie closes at a full circle
+    assert np.allclose(np.asarray(data['end'])[1::2], 2 * np.pi)
+
+def test_price_history_lines_share_one_source():
+    dates = pd.date_range('2024-01-01', periods=5)
+    prices = pd.DataFrame({'AAA': np.linspace(100, 104, 5), 'BBB': np.linspace(200, 204, 5)}, index=dates)
+    fig = plot_price_history(prices, max_sharpe_weights={'AAA': 0.25, 'BBB': 0.75})
+    sources = {id(r.data_source) for r in fig.renderers}
+    assert len(fig.renderers) == 3
+    assert len(sources) == 1
+    portfolio = fig.renderers[0].data_source.data['_max_sharpe']
+    assert np.allclose(portfolio, 0.25 * prices['AAA'] + 0.75 * prices['BBB'])
 
 def test_combined_layout(dummy_metrics_and_optimal):
     df, optimal = dummy_metrics_and_optimal
     layout = combined_layout(df, optimal)
-    assert isinstance(layout, Column)
-    # Should contain two children: efficient frontier and weights bar
-    assert len(layout.children) == 2
-    assert all(isinstance(child, FigureType) for child in layout.children)
+    assert isinstance(layout, Row)
+    # Efficient frontier on the left; price history above the pie charts on the right
+    frontier, right_column = layout.children
+    assert isinstance(frontier, FigureType)
+    assert isinstance(right_column, Column)
+    assert len(right_column.children) == 2
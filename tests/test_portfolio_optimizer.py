@@ -5,6 +5,7 @@ Unit tests for PortfolioOptimizer
 import unittest
 import numpy as np
 import pandas as pd
+from app import portfolio_optimizer
 from app.portfolio_optimizer import PortfolioOptimizer, PortfolioOptimizerError
 
 class TestPortfolioOptimizer(unittest.TestCase):
@@ -35,6 +36,95 @@ class TestPortfolioOptimizer(unittest.TestCase):
         self.assertIn('max_sharpe', optimal)
         self.assertIn('min_variance', optimal)
         self.assertIn('max_return', optimal)
+        df = po.get_metrics_df()
+        self.assertEqual(optimal['max_sharpe'], df.loc[df['Sharpe'].idxmax()].to_dict())
+        self.assertEqual(optimal['min_variance'], df.loc[df['Risk'].idxmin()].to_dict())
+        self.assertEqual(optimal['max_return'], df.loc[df['Return'].idxmax()].to_dict())
+
+    def test_simulation_matches_per_portfolio_formulas(self):
+        po = PortfolioOptimizer(self.price_data, num_portfolios=20, risk_free_rate=0.01)
+        results = po.run_simulation()
+        log_ret = np.log(self.price_data / self.price_data.shift(1))
+        mean_ret = log_ret.mean().to_numpy()
+        cov = log_ret.cov().to_numpy() * 252
+        for i in range(20):
+            # Results are float32, so compare at single precision
+            w = results['weights'][i].astype(np.float64)
+            self.assertAlmostEqual(w.sum(), 1.0, places=5)
+            self.assertTrue(np.isclose(results['returns'][i], np.exp(252 * (w @ mean_ret)) - 1, rtol=1e-4))
+            risk = np.sqrt(w @ cov @ w)
+            self.assertTrue(np.isclose(results['risk'][i], risk, rtol=1e-4))
+            self.assertTrue(np.isclose(results['sharpe_ratio'][i], (results['returns'][i] - 0.01) / risk, rtol=1e-4))
+
+    def test_results_are_float32(self):
+        results = PortfolioOptimizer(self.price_data, num_portfolios=100).run_simulation()
+        for key in ('weights', 'returns', 'risk', 'sharpe_ratio'):
+            self.assertEqual(results[key].dtype, np.float32)
+
+    def test_metrics_df_cached_until_rerun(self):
+        po = PortfolioOptimizer(self.price_data, num_portfolios=100)
+        po.run_simulation()
+        df = po.get_metrics_df()
+        self.assertIs(po.get_visualization_data()['metrics_df'], df)
+        po.run_simulation()
+        self.assertIsNot(po.get_metrics_df(), df)
+
+    def test_metrics_df_wraps_simulation_block(self):
+        po = PortfolioOptimizer(self.price_data, num_portfolios=100)
+        results = po.run_simulation()
+        df = po.get_metrics_df()
+        self.assertEqual(list(df.columns), ['Return', 'Risk', 'Sharpe', 'AAA', 'BBB'])
+        self.assertTrue(np.shares_memory(df.to_numpy(), results['returns']))
+        self.assertTrue(np.array_equal(df[['AAA', 'BBB']].to_numpy(), results['weights']))
+
+    def test_price_stats_reused_across_runs(self):
+        po = PortfolioOptimizer(self.price_data, num_portfolios=100)
+        po.run_simulation()
+        stats = po._price_stats()
+        po.num_portfolios = 200
+        po.risk_free_rate = 0.02
+        po.run_simulation()
+        self.assertIs(po._price_stats(), stats)
+        po.set_price_data(self.price_data * 2)
+        self.assertIsNone(po.results)
+        self.assertIsNot(po._price_stats(), stats)
+
+    def test_frontier_points(self):
+        rng = np.random.default_rng(0)
+        prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.02, (60, 3)), axis=0)),
+                              columns=['AAA', 'BBB', 'CCC'])
+        po = PortfolioOptimizer(prices, num_portfolios=2000)
+        results = po.run_simulation()
+        frontier = po.get_frontier_points(max_points=50)
+        self.assertLessEqual(len(frontier['Risk']), 50)
+        self.assertEqual(len(frontier['Risk']), len(frontier['Return']))
+        self.assertEqual(frontier['Risk'], sorted(frontier['Risk']))
+        # Every risk band keeps its best portfolio, so the overall best return is always kept
+        self.assertAlmostEqual(max(frontier['Return']), float(results['returns'].max()), places=6)
+
+    def test_single_asset(self):
+        po = PortfolioOptimizer(self.price_data[['AAA']], num_portfolios=100)
+        results = po.run_simulation()
+        self.assertTrue(np.allclose(results['weights'], 1.0))
+        self.assertTrue(np.allclose(results['risk'], results['risk'][0]))
+
+    @unittest.skipIf(portfolio_optimizer.njit is None, "numba not installed")
+    def test_numba_kernel_matches_numpy(self):
+        rng = np.random.default_rng(0)
+        weights = rng.dirichlet(np.ones(3), size=50).astype(np.float32)
+        mean_ret = rng.normal(0, 0.01, 3).astype(np.float32)
+        cov = (np.cov(rng.normal(0, 0.02, (30, 3)), rowvar=False) * 252).astype(np.float32)
+        expected = portfolio_optimizer._portfolio_stats(weights, mean_ret, cov, 0.02)
+        out = tuple(np.empty(50, dtype=np.float32) for _ in range(3))
+        portfolio_optimizer._portfolio_stats_numba(weights, mean_ret, cov, 0.02, *out)
+        for got, want in zip(out, expected):
+            self.assertTrue(np.allclose(got, want, rtol=1e-4))
+
+    def test_getters_require_simulation(self):
+        po = PortfolioOptimizer(self.price_data, num_portfolios=10)
+        for getter in (po.get_metrics_df, po.get_optimal_portfolios, po.get_visualization_data):
+            with self.assertRaises(PortfolioOptimizerError):
+                getter()
 
     def test_error_on_no_data(self):
         po = PortfolioOptimizer(pd.DataFrame(), num_portfolios=10)